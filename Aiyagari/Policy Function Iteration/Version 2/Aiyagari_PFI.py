@@ -142,7 +142,7 @@ class AiyagariPFI:
     
        # c. stationary distribution 
        
-       if self.distribution_method == 'discrete' or self.graph_supply_demand:
+       if self.distribution_method == 'discrete' or self.plot_supply_demand:
            self.tol_dis = 1e-6
            self.maxit_dis = 2000
        
@@ -310,7 +310,7 @@ class AiyagariPFI:
                 a_intp = interp(self.grid_a, self.pol_sav[i_z,:], a0)
                 
                 #take the grid index to the right. a_intp lies between grid_a_fine[j-1] and grid_a_fine[j]. 
-                j = np.sum(self.grid_a_fine <= a_intp) 
+                j = np.searchsorted(self.grid_a_fine, a_intp, side='right')   #binary search instead of a linear scan
                 
                     
                 #less than or equal to lowest grid value
@@ -939,7 +939,7 @@ def euler_eq_residual(a_plus, params_eer):
     c = (1+r)*a + w*z - a_plus
     
     # c. expected marginal utility from consumption next period
-    for i_zz in prange(Nz):
+    for i_zz in range(Nz):     #Nz is tiny and this sits inside the serial brentq loop -- no thread fan-out
  
         # i. consumption next period
         c_plus = (1+r)*a_plus + w*grid_z[i_zz] - interp(grid_a, pol_sav_old[i_zz, :], a_plus)
@@ -1109,49 +1109,55 @@ def discrete_stationary_density(pol_sav, params_discrete):
     
     Na_fine = len(grid_a_fine)
     
-    # initial guess uniform distribution
+    # initial guess uniform distribution, kept in (Na_fine, Nz) orientation so the
+    # income-state updates inside the iteration write adjacent memory
     stationary_pdf_old = np.ones((Na_fine, Nz))/Na_fine
     stationary_pdf_old = stationary_pdf_old * np.transpose(pi_stat)
-    stationary_pdf_old = stationary_pdf_old.T
     
+    # hoist the policy interpolation out of the fixed point iteration: the bracket
+    # index j and weight p0 of every savings choice depend only on pol_sav, so they
+    # are computed once up front (binary search instead of a linear scan) and the
+    # iteration does pure mass redistribution. the clamped index and weight
+    # reproduce the old left/right edge handling: off the left edge the raw weight
+    # is <= 0, off the right edge it is >= 1.
+    j_mat = np.zeros((Nz, Na_fine), dtype=np.int64)
+    p_mat = np.zeros((Nz, Na_fine))
+
+    for iz in range(Nz):
+
+        a_intp = np.interp(grid_a_fine, grid_a, pol_sav[iz,:]) # linear interpolation for a'(z, a)
+
+        for ia in range(Na_fine):
+
+            j = min(max(np.searchsorted(grid_a_fine, a_intp[ia], side='right'), 1), Na_fine-1)
+            p0 = (a_intp[ia]-grid_a_fine[j-1]) / (grid_a_fine[j]-grid_a_fine[j-1])
+
+            j_mat[iz, ia] = j
+            p_mat[iz, ia] = min(max(p0, 0.0), 1.0)
+
     # b. fixed point iteration
     for it in range(maxit):   # iteration 
         
-        stationary_pdf = np.zeros((Nz, Na_fine))    # distribution in period t+1
+        stationary_pdf = np.zeros((Na_fine, Nz))    # distribution in period t+1
              
         for iz in range(Nz):     # iteration over productivity types in period t
             
-            for ia, a0 in enumerate(grid_a_fine):  # iteration over assets in period t
+            for ia in range(Na_fine):  # iteration over assets in period t
                 
-                # i. interpolate 
+                # i. cached bracket of the savings choice a'(z, a). it lies between
+                # grid_a_fine[j-1] and grid_a_fine[j] with weight p0 on the right node
                 
-                a_intp = interp(grid_a, pol_sav[iz,:], a0) # linear interpolation for a'(z, a) 
-                   
-                # ii. obtain distribution in period t+1   
+                j = j_mat[iz, ia]
+                p0 = p_mat[iz, ia]
+                mass = stationary_pdf_old[ia, iz]
                 
-                #left edge of the grid
-                if a_intp <= grid_a_fine[0]:
-                    for izz in range(Nz):
-                        stationary_pdf[izz,0] = stationary_pdf[izz,0] + stationary_pdf_old[iz,ia]*pi[iz,izz]
-                        
+                # ii. obtain distribution in period t+1. the izz loop touches the
+                # contiguous row pair (j-1, j) of the (Na_fine, Nz) layout
                 
-                #right edge of the grid
-                elif a_intp >= grid_a_fine[-1]:
-                    for izz in range(Nz):
-                        stationary_pdf[izz,-1] = stationary_pdf[izz,-1] + stationary_pdf_old[iz,ia]*pi[iz,izz]
-                        
-                    
-                #inside the grid range, linearly interpolate
-                else:
-                    
-                    j = np.sum(grid_a_fine <= a_intp) # a_intp lies between grid_a_fine[j-1] and grid_a_fine[j]
-                    
-                    p0 = (a_intp-grid_a_fine[j-1]) / (grid_a_fine[j]-grid_a_fine[j-1])
-                    
-                    for izz in range(Nz):
-                    
-                        stationary_pdf[izz,j] = stationary_pdf[izz,j] + p0*stationary_pdf_old[iz,ia]*pi[iz,izz]
-                        stationary_pdf[izz,j-1] =stationary_pdf[izz,j-1] + (1-p0)*stationary_pdf_old[iz,ia]*pi[iz,izz]
+                for izz in range(Nz):
+                
+                    stationary_pdf[j,izz] = stationary_pdf[j,izz] + p0*mass*pi[iz,izz]
+                    stationary_pdf[j-1,izz] =stationary_pdf[j-1,izz] + (1-p0)*mass*pi[iz,izz]
         
         
         #stationary distribution by percent 
@@ -1166,7 +1172,8 @@ def discrete_stationary_density(pol_sav, params_discrete):
         else:
             stationary_pdf_old = np.copy(stationary_pdf)
         
-    return stationary_pdf, it
+    # hand back the (Nz, Na_fine) orientation the callers expect
+    return stationary_pdf.T, it
 
 
 
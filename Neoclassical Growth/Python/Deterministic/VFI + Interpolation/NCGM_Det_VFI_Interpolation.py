@@ -177,18 +177,19 @@ class ncgmVFIandINTERPOLATE:
         
         VF_old    = np.linspace(0,1,self.Nk)  #initial guess
         
-        VF = np.copy(VF_old)    #contracted value function aka Tv
-        pol_kp = np.copy(VF_old)    # next period capital policy function
-        pol_cons = np.copy(VF_old)      #consumption policy function
+        VF = np.zeros(self.Nk)    #contracted value function aka Tv
+        pol_cons = np.zeros(self.Nk)      #consumption policy function
         
         util = self.utility(self.grid_c)   #utility evaluated on the consumption grid
         
+        cash = self.grid_k**self.alpha + (1-self.delta)*self.grid_k    #cash-on-hand, iteration invariant
+        
         # b. Iterate
         for it in range(self.maxit) :
             for ik in range(self.Nk):
                 
                 # i. resource constrant
-                kp = self.grid_k[ik]**self.alpha + (1-self.delta)*self.grid_k[ik] - self.grid_c
+                kp = cash[ik] - self.grid_c
                 
                 # ii. interpolate 
                 interpolant = interpolate.UnivariateSpline(self.grid_k, VF_old, k=3, s=0) 
@@ -214,7 +215,7 @@ class ncgmVFIandINTERPOLATE:
             VF_old = np.copy(VF)
      
         # vi. next period capital policy function
-        pol_kp = self.grid_k**self.alpha + +(1-self.delta)*self.grid_k - pol_cons
+        pol_kp = cash - pol_cons
         
         return VF, pol_kp, pol_cons, it
 
@@ -25,7 +25,7 @@ Requirements file:
 import time
 import numpy as np
 from scipy import interpolate
-from numba import njit, prange
+from numba import njit
 import matplotlib.pyplot as plt
 import seaborn as sns
 sns.set(style='whitegrid')
@@ -117,21 +117,15 @@ class ncgmVFI:
         return (2 * (x - x_min) / (x_max - x_min)) - 1
         
     def chebyshev_polynomial(self, roots, n):
-        """ 
-        Constructs a psuedo-Vandermonde matrix of Chebyshev polynomial expansion using the recurrence relation
-        
-        This function is equivalent to np.polynomial.chebyshev.chebvander(roots, n-1)
         """
-        T = np.zeros((np.size(roots),n))
-    
-        T[:,0] = np.ones((np.size(roots),1)).T
-    
-        T[:,1] = roots.T
-    
-        for i in range(1,n-1):
-            T[:,i+1] = 2 * roots * T[:,i] - T[:,i-1]
-            
-        return T
+        Constructs a psuedo-Vandermonde matrix of Chebyshev polynomial expansion.
+
+        Delegates to np.polynomial.chebyshev.chebvander, which runs the same
+        recurrence in C and produces the identical matrix without the hand-rolled
+        loop and its throwaway 2-d ones allocation.
+        """
+
+        return np.polynomial.chebyshev.chebvander(np.ravel(roots), n-1)
 
 
 
@@ -178,30 +172,27 @@ class ncgmVFI:
             # ii. matrix of chebyshev polynomials
             Tk = self.chebyshev_polynomial(roots_k, self.cheb_order)
             
-            # iii. compute OLS
+            # iii. compute OLS and sample the fitted policy densely on the grid
             theta = np.linalg.lstsq(Tk, self.pol_kp, rcond=None)[0]
-            
+
+            kp_approx = np.dot(Tk, theta)
+
             # view approximation 
             
             if self.plott:
                 plt.plot(self.grid_k, self.pol_kp)
-                plt.plot(self.grid_k, np.dot(Tk,theta), linestyle='--')
+                plt.plot(self.grid_k, kp_approx, linestyle='--')
                 plt.title('Chebyshev Approximation of Capital Policy Function')
                 plt.legend(['True Policy Function', 'Chebyshev Approximated Policy Function'])
                 plt.xlabel('Capital Grid')
                 #plt.savefig('Figures Transition/cheby_approx_ncgm_vfi.pdf')
                 plt.show()
                 
-            # iv. iterate forward
+            # iv. iterate forward. the fitted policy is already sampled on the dense
+            # capital grid, so each step is one linear interpolation into that sample
+            # instead of re-evaluating the chebyshev expansion.
             for it in range(self.sim_T):
-                # convert capital value to chebyshev node
-                root_kt = self.grid_to_nodes(trans_k[it], self.k_min, self.k_max)
-                
-                # matrix of chebyshev polynomials for given node
-                Tkt = self.chebyshev_polynomial(root_kt, self.cheb_order)
-                
-                # interpolate 
-                trans_k[it+1] = np.dot(Tkt, theta)
+                trans_k[it+1] = np.interp(trans_k[it], self.grid_k, kp_approx)
                 
                 
         # d. get the other variables
@@ -233,7 +224,11 @@ class ncgmVFI:
         
         print("\nSolving social planner problem...")
     
-        self.VF, self.pol_kp, self.pol_cons, self.it = vfi_det(self.params)
+        # pick the utility specialization once: numba compiles vfi_det against the
+        # passed jitted function, so the sweep itself has no branch on sigma
+        utility = utility_log if self.sigma == 1 else utility_crra
+
+        self.VF, self.pol_kp, self.pol_cons, self.it = vfi_det(self.params, utility)
         
         if self.it < self.maxit-1:
             print(f"Convergence in {self.it} iterations.")
@@ -340,14 +335,25 @@ class ncgmVFI:
 ########################
         
 
-@njit    
-def utility(c, sigma):
-    eps = 1e-8
-    
-    if  sigma == 1:
-        return np.log(np.fmax(c, eps))
-    else:
-        return (np.fmax(c, eps) ** (1 - sigma) -1) / (1 - sigma)
+@njit
+def utility_log(c, sigma):
+    """
+    Log utility, the sigma = 1 case. The unused sigma argument keeps the
+    signature interchangeable with utility_crra so vfi_det can take either.
+    """
+
+    # scalar max: the bellman sweep calls this once per candidate, and a plain
+    # max compiles to a single instruction where the ufunc would add call overhead
+    return np.log(max(c, 1e-8))
+
+@njit
+def utility_crra(c, sigma):
+    """
+    CRRA utility for sigma != 1. The caller picks the specialization once, so
+    the bellman sweep carries no per-call branch on sigma.
+    """
+
+    return (max(c, 1e-8) ** (1 - sigma) -1) / (1 - sigma)
     
     
     
@@ -356,61 +362,99 @@ def utility(c, sigma):
 # 2. Value Function Iteration  #
 ################################
 
-@njit(parallel=True)
-def vfi_det(params):
-   
+@njit
+def vfi_det(params, utility):
+
     """
-    Value function iteration to solve the social planner problem
-    
+    Value function iteration to solve the social planner problem. The search
+    over next period capital exploits that the optimal k'(k) is monotone
+    non-decreasing in k (the model is concave), so each sweep starts the
+    search at the previous maximizer and stops as soon as the bellman RHS
+    starts falling, collapsing the O(Nk^2) sweep to roughly O(Nk) work.
+
     *Input
         *Model parameters
-    
+
     *Output
         * VF is value function
         * pol_kp is k' or savings policy function
         * pol_cons is the consumption policy function
-        * it is the iteration number 
+        * it is the iteration number
     """
 
     # a. Initialize counters, initial guess. storage matriecs
-    
+
     sigma, beta, delta, alpha, grid_k, Nk, maxit, tol = params
-    
+
     VF_old    = np.zeros(Nk)  #initial guess
-    VF = np.copy(VF_old)    #contracted value function aka Tv
-    pol_kp = np.copy(VF_old)    
-    pol_cons = np.copy(VF_old)
-    
-    # b. Iterate
+    VF = np.empty(Nk)    #contracted value function aka Tv
+    pol_kp_idx = np.zeros(Nk, dtype=np.int64)
+    util_star = np.empty(Nk)    #utility at the current policy, for the howard steps
+
+    howard_K = 50   #policy evaluation steps between maximization sweeps
+
+    # b. cash-on-hand today, iteration invariant
+    cash = grid_k**alpha + (1-delta)*grid_k
+
+    # c. Iterate. the sweep is serial in ik because the search bound carries over.
     for it in range(maxit) :
-        for ik in prange(Nk):
-            
-            # i. resource constrant
-            c = grid_k[ik]**alpha + (1-delta)*grid_k[ik] - grid_k
-            
-            # ii. utility and impose nonnegativity for consumption
-            util = utility(c, sigma)
-            util[c < 0] = -10e10
-            
-            # iii. value and policy functions
-            RHS = util + beta*VF_old   #RHS of Bellman
-            
-            VF[ik] = np.max(RHS) #take maximum value for value function
-            
-            pol_kp[ik] = grid_k[np.argmax(RHS)]    #policy function for how much to save
-       
-        # iv. calculate su-norm
+
+        j_lo = 0    #lower bound for the policy search, only moves forward in ik
+
+        for ik in range(Nk):
+
+            best = -np.inf
+            j_best = j_lo
+
+            for j in range(j_lo, Nk):
+
+                # i. resource constrant and utility with nonnegativity imposed
+                c = cash[ik] - grid_k[j]
+
+                if c > 0:
+                    v = utility(c, sigma) + beta*VF_old[j]   #RHS of Bellman
+                else:
+                    v = -10e10 + beta*VF_old[j]
+
+                # ii. the RHS is single peaked in k': walk up, stop once it falls
+                if v > best:
+                    best = v
+                    j_best = j
+                elif v < best:
+                    break
+
+            VF[ik] = best #maximum value for value function
+            pol_kp_idx[ik] = j_best    #policy index for how much to save
+            j_lo = j_best
+
+        # iii. calculate su-norm
         dist = np.abs(VF-VF_old).max()
-       
+
         if dist < tol :
             break
-        
-        VF_old = np.copy(VF)
-        
-    # v. consumption policy function
-    pol_cons = grid_k**alpha + (1-delta)*grid_k - pol_kp
- 
-    
+
+        VF_old, VF = VF, VF_old     #swap buffers instead of copying
+
+        # iv. howard acceleration (modified policy iteration): hold the policy
+        # fixed and apply the evaluation operator howard_K times. each step is an
+        # O(Nk) gather instead of a maximization sweep, so the expensive argmax
+        # runs only once per outer iteration.
+        for ik in range(Nk):
+            util_star[ik] = utility(cash[ik] - grid_k[pol_kp_idx[ik]], sigma)
+
+        for h in range(howard_K):
+            for ik in range(Nk):
+                VF[ik] = util_star[ik] + beta*VF_old[pol_kp_idx[ik]]
+
+            VF_old, VF = VF, VF_old
+
+    # d. policy functions
+    pol_kp = grid_k[pol_kp_idx]    #policy function for how much to save
+
+    # consumption policy function
+    pol_cons = cash - pol_kp
+
+
     return VF, pol_kp, pol_cons, it
         
 
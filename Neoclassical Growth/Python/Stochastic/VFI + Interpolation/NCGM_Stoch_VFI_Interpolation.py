@@ -252,19 +252,22 @@ class ncgmVFIandINTERPOLATE:
         # a. Initialize counters, initial guess. storage matriecs
         
         VF_old = np.linspace(0,1,Nk)*np.ones((self.Nz, Nk))  #initial guess
-        VF = np.copy(VF_old)    #contracted value function aka Tv
-        pol_kp = np.copy(VF_old)    # next period capital (k') policy function
-        pol_cons = np.copy(VF_old)      #consumption policy function
+        VF = np.zeros((self.Nz, Nk))    #contracted value function aka Tv
+        pol_kp = np.zeros((self.Nz, Nk))    # next period capital (k') policy function
+        pol_cons = np.zeros((self.Nz, Nk))      #consumption policy function
         
         util = self.utility(self.grid_c)   #utility evaluated on the consumption grid
         
+        # cash-on-hand by state, iteration invariant
+        cash = self.grid_z[:,None]*grid_k[None,:]**self.alpha + (1-self.delta)*grid_k[None,:]
+        
         # b. Iterate
         for it in range(self.maxit) :
             for iz in range(self.Nz):
                 for ik in range(Nk):
                     
                     # i. resource constrant
-                    kp = self.grid_z[iz]*grid_k[ik]**self.alpha + (1-self.delta)*grid_k[ik] - self.grid_c
+                    kp = cash[iz,ik] - self.grid_c
                     
                     # ii. interpolate 
                     
@@ -279,7 +282,7 @@ class ncgmVFIandINTERPOLATE:
                     pol_cons[iz,ik] = self.grid_c[np.argmax(RHS)]
                 
                 # vi. next period capital policy function
-                pol_kp[iz,:] = self.grid_z[iz]*grid_k**self.alpha +(1-self.delta)*grid_k - pol_cons[iz,:]
+                pol_kp[iz,:] = cash[iz,:] - pol_cons[iz,:]
             
             # v. calculate supnorm
             dist = np.abs(VF-VF_old).max()
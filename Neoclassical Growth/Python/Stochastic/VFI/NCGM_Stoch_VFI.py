@@ -627,9 +627,13 @@ def vfi(params):
     sigma, beta, delta, alpha, grid_k, grid_z, Nz, Nk, pi, maxit, tol = params
     
     VF_old  = np.zeros((Nz,Nk))  #initial guess
-    VF = np.copy(VF_old)    #contracted value function aka Tv
-    pol_kp = np.copy(VF_old)    # next period capital (k') policy function
-    pol_cons = np.copy(VF_old)  # consumption policy funnction
+    VF = np.zeros((Nz,Nk))    #contracted value function aka Tv
+    pol_kp_idx = np.zeros((Nz,Nk), dtype=np.int64)    # next period capital (k') policy indices
+    
+    # cash-on-hand by state, iteration invariant
+    cash = np.zeros((Nz,Nk))
+    for iz in range(Nz):
+        cash[iz,:] = grid_z[iz]*grid_k**alpha + (1-delta)*grid_k
     
     # b. Iterate
     for it in range(maxit) :
@@ -637,7 +641,7 @@ def vfi(params):
             for ik in prange(Nk):
                 
                 # i. resource constrant
-                c = grid_z[iz]*grid_k[ik]**alpha + (1-delta)*grid_k[ik] - grid_k
+                c = cash[iz,ik] - grid_k
                 
                 # ii. utility and impose nonnegativity for consumption
                 util = utility(c, sigma)
@@ -648,10 +652,7 @@ def vfi(params):
                 
                 VF[iz,ik] = np.max(RHS) #take maximum value for value function
                 
-                pol_kp[iz,ik] = grid_k[np.argmax(RHS)]    #policy function for how much to save
-                
-            # consumption policy function
-            pol_cons[iz,:] = grid_z[iz]*grid_k**alpha + (1-delta)*grid_k - pol_kp[iz,:]
+                pol_kp_idx[iz,ik] = np.argmax(RHS)    #policy index for how much to save
        
         # iv. calculate supnorm
         dist = np.abs(VF-VF_old).max()
@@ -661,6 +662,12 @@ def vfi(params):
         
         VF_old = np.copy(VF)
  
+    # policy functions, materialized from the converged indices
+    pol_kp = np.zeros((Nz,Nk))
+    pol_cons = np.zeros((Nz,Nk))
+    for iz in range(Nz):
+        pol_kp[iz,:] = grid_k[pol_kp_idx[iz,:]]
+        pol_cons[iz,:] = cash[iz,:] - pol_kp[iz,:]
     
     return VF, pol_kp, pol_cons, it
         